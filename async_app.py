@@ -0,0 +1,321 @@
+#Async serving mode: the customer, customer account, product and order endpoints of Main.py served as coroutines
+#on SQLAlchemy's asyncio extension, so a request waiting on the database doesn't hold an OS thread
+#run with: hypercorn "async_app:create_async_app()"
+from quart import Blueprint, Quart, abort, current_app, jsonify, request
+from marshmallow import ValidationError
+from sqlalchemy import make_url, select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import selectinload
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from werkzeug.security import generate_password_hash
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import os
+
+from Main import (Customer, CustomerAccount, Order, OrderLine, OrjsonProvider, Product, bump_versions_statement, customer_schema,
+                  customeraccount_schema, customeraccounts_schema, customers_schema, database_uri, engine_options, order_product,
+                  order_schema, orders_schema, orjson, parse_product_quantities, product_schema, products_schema)
+
+#async drivers used in place of the blocking ones named in the sync connection URI
+ASYNC_DRIVERS = {
+    'sqlite': 'sqlite+aiosqlite',
+    'mysql': 'mysql+aiomysql',
+}
+
+def async_database_uri(uri):
+    #swap the sync driver of the connection URI for its async counterpart
+    url = make_url(uri)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername)).render_as_string(hide_password=False)
+
+#routes of the async app, registered on each app built by create_async_app
+bp = Blueprint('async_api', __name__)
+
+def sessions():
+    return current_app.extensions['async_sessions']
+
+async def hash_password(password):
+    #hash on the bounded password pool so slow hashes don't block the event loop
+    method = f"pbkdf2:sha256:{current_app.config['PASSWORD_HASH_ITERATIONS']}"
+    return await asyncio.get_running_loop().run_in_executor(current_app.extensions['password_pool'], generate_password_hash, password, method)
+
+async def get_or_404(session, model, id, *options):
+    #load a row by primary key or abort with a 404
+    instance = await session.get(model, id, options=options)
+    if instance is None:
+        abort(404)
+    return instance
+
+async def bump_versions(session, *tables):
+    #mark the tables as changed so the ETags Main.py hands out for them stop matching, after the write is committed
+    await session.execute(bump_versions_statement(*tables))
+    await session.commit()
+
+async def load_json(schema):
+    #Validate and deserialize the request body with the schema
+    return schema.load(await request.get_json())
+
+#Default route
+@bp.route('/')
+async def home():
+    return 'Welcome to the E-commerce Management System!'
+
+@bp.route('/customers', methods=['GET'])
+async def get_customers():
+    #query for all customers and return serialized data
+    async with sessions()() as session:
+        customers = (await session.scalars(select(Customer).order_by(Customer.id))).all()
+        return jsonify(customers_schema.dump(customers))
+
+@bp.route('/customers/<int:id>', methods=['GET'])
+async def get_customer(id):
+    async with sessions()() as session:
+        customer = await get_or_404(session, Customer, id)
+        return jsonify(customer_schema.dump(customer)), 200
+
+@bp.route('/customers', methods=['POST'])
+async def add_customer():
+    try:
+        customer_data = await load_json(customer_schema)
+    except ValidationError as err:
+        return jsonify(err.messages), 400
+
+    async with sessions()() as session:
+        session.add(Customer(name=customer_data['name'], email=customer_data['email'], phone=customer_data['phone']))
+        await session.commit()
+        await bump_versions(session, 'customers')
+    return jsonify({"message": "New customer added successfully"}), 201
+
+@bp.route('/customers/<int:id>', methods=['PUT'])
+async def update_customer(id):
+    async with sessions()() as session:
+        customer = await get_or_404(session, Customer, id)
+        try:
+            customer_data = await load_json(customer_schema)
+        except ValidationError as err:
+            return jsonify(err.messages), 400
+
+        customer.name = customer_data['name']
+        customer.email = customer_data['email']
+        customer.phone = customer_data['phone']
+        await session.commit()
+        await bump_versions(session, 'customers')
+    return jsonify({"message": "Customer details updated successfully"}), 200
+
+@bp.route('/customers/<int:id>', methods=['DELETE'])
+async def delete_customer(id):
+    async with sessions()() as session:
+        customer = await get_or_404(session, Customer, id)
+        await session.delete(customer)
+        await session.commit()
+        await bump_versions(session, 'customers', 'orders')
+    return jsonify({"message": "Customer removed successfully"}), 200
+
+@bp.route('/customeraccounts', methods=['GET'])
+async def get_customer_accounts():
+    #the linked customer is loaded up front since lazy loading can't run on the event loop
+    async with sessions()() as session:
+        customer_accounts = (await session.scalars(select(CustomerAccount).options(selectinload(CustomerAccount.customer)))).all()
+        return jsonify(customeraccounts_schema.dump(customer_accounts))
+
+@bp.route('/customeraccounts/<int:id>', methods=['GET'])
+async def get_customer_account(id):
+    async with sessions()() as session:
+        customer_account = await get_or_404(session, CustomerAccount, id, selectinload(CustomerAccount.customer))
+        return jsonify(customeraccount_schema.dump(customer_account))
+
+@bp.route('/customeraccounts', methods=['POST'])
+async def add_customer_account():
+    try:
+        customer_account_data = await load_json(customeraccount_schema)
+    except ValidationError as err:
+        return jsonify(err.messages), 400
+
+    password = await hash_password(customer_account_data['password'])
+    async with sessions()() as session:
+        session.add(CustomerAccount(username=customer_account_data['username'], password=password, customer_id=customer_account_data['customer_id']))
+        await session.commit()
+    return jsonify({"message": "New Customer Account added successfully"}), 201
+
+@bp.route('/customeraccounts/<int:id>', methods=['PUT'])
+async def update_customer_account(id):
+    async with sessions()() as session:
+        customer_account = await get_or_404(session, CustomerAccount, id)
+        try:
+            customer_account_data = await load_json(customeraccount_schema)
+        except ValidationError as err:
+            return jsonify(err.messages), 400
+
+        customer_account.username = customer_account_data['username']
+        customer_account.password = await hash_password(customer_account_data['password'])
+        customer_account.customer_id = customer_account_data['customer_id']
+        await session.commit()
+    return jsonify({"message": "Customer Account updated successfully"})
+
+@bp.route('/customeraccounts/<int:id>', methods=['DELETE'])
+async def delete_customer_account(id):
+    async with sessions()() as session:
+        customer_account = await get_or_404(session, CustomerAccount, id)
+        await session.delete(customer_account)
+        await session.commit()
+    return jsonify({"message": "Customer Account removed successfully"}), 200
+
+@bp.route('/products', methods=['GET'])
+async def get_products():
+    async with sessions()() as session:
+        products = (await session.scalars(select(Product))).all()
+        return jsonify(products_schema.dump(products))
+
+@bp.route('/products/<int:id>', methods=['GET'])
+async def get_product(id):
+    async with sessions()() as session:
+        product = await get_or_404(session, Product, id)
+        return jsonify(product_schema.dump(product)), 200
+
+@bp.route('/products', methods=['POST'])
+async def add_product():
+    try:
+        product_data = await load_json(product_schema)
+    except ValidationError as err:
+        return jsonify(err.messages), 400
+
+    async with sessions()() as session:
+        session.add(Product(product_name=product_data['product_name'], price=product_data['price'], stock_quantity=product_data['stock_quantity']))
+        await session.commit()
+        await bump_versions(session, 'products')
+    return jsonify({"message": "Product was added successfully"}), 201
+
+@bp.route('/products/<int:id>', methods=['PUT'])
+async def update_product(id):
+    async with sessions()() as session:
+        product = await get_or_404(session, Product, id)
+        try:
+            product_data = await load_json(product_schema)
+        except ValidationError as err:
+            return jsonify(err.messages), 400
+
+        product.product_name = product_data['product_name']
+        product.price = product_data['price']
+        product.stock_quantity = product_data['stock_quantity']
+        await session.commit()
+        await bump_versions(session, 'products')
+    return jsonify({"message": "Product updated successfully"}), 200
+
+@bp.route('/products/<int:id>', methods=['DELETE'])
+async def delete_product(id):
+    async with sessions()() as session:
+        product = await get_or_404(session, Product, id)
+        await session.delete(product)
+        await session.commit()
+        await bump_versions(session, 'products', 'orders')
+    return jsonify({"message": "Product deleted successfully"}), 200
+
+@bp.route('/orders', methods=['POST'])
+async def add_order():
+    try:
+        order_data = await load_json(order_schema)
+        quantities = parse_product_quantities(request.args.getlist('Product'))
+    except ValidationError as err:
+        return jsonify(err.messages), 400
+
+    async with sessions()() as session:
+        #resolve every product with a single IN query and reject the order if any of them don't exist
+        found_ids = set(await session.scalars(select(Product.id).where(Product.id.in_(list(quantities)))))
+        missing_ids = [product_id for product_id in quantities if product_id not in found_ids]
+        if missing_ids:
+            return jsonify({"message": "Unable to find products", "missing_product_ids": missing_ids}), 400
+
+        #take the stock first with conditional updates, in id order so concurrent orders lock rows the same way
+        out_of_stock_ids = []
+        for product_id in sorted(quantities):
+            result = await session.execute(
+                update(Product)
+                .where(Product.id == product_id, Product.stock_quantity >= quantities[product_id])
+                .values(stock_quantity=Product.stock_quantity - quantities[product_id])
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount == 0:
+                out_of_stock_ids.append(product_id)
+        if out_of_stock_ids:
+            await session.rollback()
+            return jsonify({"message": "Insufficient stock", "out_of_stock_product_ids": out_of_stock_ids}), 409
+
+        #create the order, then link the products to it with one multi-row insert and commit
+        new_order = Order(customer_id=order_data['customer_id'], date=order_data['date'], expected_delivery=order_data['expected_delivery'])
+        session.add(new_order)
+        await session.flush()
+        await session.execute(order_product.insert(), [{'order_id': new_order.id, 'product_id': product_id, 'quantity': quantity} for product_id, quantity in quantities.items()])
+        await session.commit()
+        await bump_versions(session, 'products', 'orders')
+    return jsonify({"message": "Order was added successfully"}), 201
+
+@bp.route('/orders', methods=['GET'])
+async def get_orders():
+    #products are loaded with one extra IN query since lazy loading can't run on the event loop
+    async with sessions()() as session:
+        orders = (await session.scalars(select(Order).options(selectinload(Order.lines).joinedload(OrderLine.product)))).all()
+        return jsonify(orders_schema.dump(orders))
+
+@bp.route('/orders/<int:id>', methods=['GET'])
+async def get_order(id):
+    async with sessions()() as session:
+        order = await get_or_404(session, Order, id, selectinload(Order.lines).joinedload(OrderLine.product))
+        return jsonify(order_schema.dump(order)), 200
+
+@bp.route('/orders/<int:id>', methods=['PUT'])
+async def update_order(id):
+    async with sessions()() as session:
+        order = await get_or_404(session, Order, id)
+        try:
+            order_data = await load_json(order_schema)
+        except ValidationError as err:
+            return jsonify(err.messages), 400
+
+        order.customer_id = order_data['customer_id']
+        order.date = order_data['date']
+        order.expected_delivery = order_data['expected_delivery']
+        await session.commit()
+        await bump_versions(session, 'orders')
+    return jsonify({"message": "Order updated successfully"}), 200
+
+@bp.route('/orders/<int:id>', methods=['DELETE'])
+async def delete_order(id):
+    async with sessions()() as session:
+        order = await get_or_404(session, Order, id)
+        await session.delete(order)
+        await session.commit()
+        await bump_versions(session, 'orders')
+    return jsonify({"message": "Order deleted successfully"}), 200
+
+def create_async_app(config=None):
+    #build the async app from the same environment settings as create_app, overridden by the config mapping
+    app = Quart(__name__)
+    app.config['PASSWORD_HASH_ITERATIONS'] = int(os.environ.get('PASSWORD_HASH_ITERATIONS', 600000))
+    app.config['PASSWORD_HASH_WORKERS'] = int(os.environ.get('PASSWORD_HASH_WORKERS', os.cpu_count() or 1))
+    app.config['JSON_PROVIDER'] = os.environ.get('JSON_PROVIDER', 'orjson')
+    if config:
+        app.config.update(config)
+    if 'SQLALCHEMY_DATABASE_URI' not in app.config:
+        app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('ASYNC_DATABASE_URL') or async_database_uri(database_uri())
+    if 'SQLALCHEMY_ENGINE_OPTIONS' not in app.config:
+        #the same pool settings as the sync app, on the asyncio compatible queue pool
+        options = engine_options(app.config['SQLALCHEMY_DATABASE_URI'])
+        if 'poolclass' in options:
+            options['poolclass'] = AsyncAdaptedQueuePool
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+
+    if app.config['JSON_PROVIDER'] == 'orjson' and orjson is not None:
+        app.json = OrjsonProvider(app)
+
+    #no connection is made until the first request
+    engine = create_async_engine(app.config['SQLALCHEMY_DATABASE_URI'], **app.config['SQLALCHEMY_ENGINE_OPTIONS'])
+    app.extensions['async_engine'] = engine
+    app.extensions['async_sessions'] = async_sessionmaker(engine, expire_on_commit=False)
+    app.extensions['password_pool'] = ThreadPoolExecutor(max_workers=app.config['PASSWORD_HASH_WORKERS'], thread_name_prefix='password-hash')
+
+    app.register_blueprint(bp)
+
+    @app.after_serving
+    async def dispose_engine():
+        await engine.dispose()
+
+    return app
@@ -0,0 +1,122 @@
+#Async benchmark: compares request throughput of the sync app and the async app as concurrent connections grow
+#each mode is served in its own process (threaded Werkzeug server for sync, Hypercorn for async) against the same database
+#usage: python benchmarks/async_bench.py [--concurrency 10,50,200] [--requests 2000] [--database-url sqlite:////tmp/async_bench.db] [--drop]
+import argparse
+import datetime
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from sqlalchemy import create_engine, insert
+
+from Main import Customer, Order, Product, order_product
+from async_app import async_database_uri
+from bench_db import add_drop_argument, prepare_tables
+
+SYNC_SERVER = """
+import sys
+from werkzeug.serving import make_server
+from Main import create_app
+make_server('127.0.0.1', int(sys.argv[1]), create_app(), threaded=True).serve_forever()
+"""
+
+def seed(database_url, rows, drop):
+    #fresh tables with customers, products and one order per customer holding two products
+    engine = create_engine(database_url)
+    prepare_tables(engine, drop)
+    with engine.begin() as connection:
+        connection.execute(insert(Customer), [{'name': f'Customer {i}', 'email': f'customer{i}@example.com', 'phone': '1234567890'} for i in range(1, rows + 1)])
+        connection.execute(insert(Product), [{'product_name': f'Product {i}', 'price': 9.99, 'stock_quantity': 100} for i in range(1, rows + 1)])
+        connection.execute(insert(Order), [{'customer_id': i, 'date': datetime.date(2024, 8, 1), 'expected_delivery': datetime.date(2024, 8, 6)} for i in range(1, rows + 1)])
+        connection.execute(insert(order_product), [{'order_id': i, 'product_id': product_id, 'quantity': 1} for i in range(1, rows + 1) for product_id in (i, rows + 1 - i)])
+    engine.dispose()
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def start_server(mode, database_url, port):
+    #caching is switched off so both modes do the same database work per request
+    env = dict(os.environ, DATABASE_URL=database_url, ASYNC_DATABASE_URL=async_database_uri(database_url), PRODUCT_CACHE_MAXSIZE='0')
+    if mode == 'sync':
+        command = [sys.executable, '-c', SYNC_SERVER, str(port)]
+    else:
+        command = [sys.executable, '-m', 'hypercorn', 'async_app:create_async_app()', '--bind', f'127.0.0.1:{port}']
+    server = subprocess.Popen(command, cwd=REPO_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    #wait until the server answers
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f'http://127.0.0.1:{port}/', timeout=1).read()
+            return server
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError(f'{mode} server did not start')
+
+def fetch(url):
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(url, timeout=60) as response:
+            response.read()
+            ok = response.status == 200
+    except (urllib.error.URLError, ConnectionError):
+        ok = False
+    return ok, (time.perf_counter() - start) * 1000
+
+def run_level(port, paths, concurrency, requests):
+    #keep concurrency requests in flight until the budget is spent
+    urls = [f'http://127.0.0.1:{port}{paths[i % len(paths)]}' for i in range(requests)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(fetch, urls))
+    elapsed = time.perf_counter() - start
+    latencies = [latency for ok, latency in results if ok]
+    cut_points = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else [0.0] * 99
+    return {
+        'concurrency': concurrency,
+        'requests_per_s': round(len(latencies) / elapsed, 1),
+        'errors': len(results) - len(latencies),
+        'p50_ms': round(cut_points[49], 2),
+        'p95_ms': round(cut_points[94], 2),
+        'p99_ms': round(cut_points[98], 2),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare sync and async serving throughput under concurrent connections')
+    parser.add_argument('--concurrency', default='10,50,200', help='comma separated numbers of concurrent connections')
+    parser.add_argument('--requests', type=int, default=2000, help='requests per concurrency level')
+    parser.add_argument('--rows', type=int, default=1000, help='customers, products and orders to seed')
+    parser.add_argument('--paths', default='/products/1,/customers/1,/orders/1', help='comma separated paths requested in turn')
+    parser.add_argument('--database-url', default='sqlite:////tmp/async_bench.db', help='sync SQLAlchemy URI, the async driver is derived from it')
+    parser.add_argument('--modes', default='sync,async')
+    add_drop_argument(parser)
+    args = parser.parse_args()
+
+    seed(args.database_url, args.rows, args.drop)
+    paths = args.paths.split(',')
+    report = {'requests': args.requests, 'paths': paths, 'results': {}}
+    for mode in args.modes.split(','):
+        port = free_port()
+        server = start_server(mode, args.database_url, port)
+        try:
+            report['results'][mode] = [run_level(port, paths, int(level), args.requests) for level in args.concurrency.split(',')]
+        finally:
+            server.terminate()
+            server.wait()
+    print(json.dumps(report, indent=4))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,32 @@
+#Database setup shared by the benchmarks that seed their own tables
+#a database that already holds rows is only dropped when the benchmark is run with --drop
+import sys
+
+from sqlalchemy import inspect, select
+
+from Main import db
+
+def pool_options(database_url, size):
+    #one pooled connection per worker thread, SQLite waits for the write lock instead of failing straight away
+    options = {'pool_size': size, 'max_overflow': 0}
+    if database_url.startswith('sqlite'):
+        options['connect_args'] = {'timeout': 30}
+    return options
+
+def has_rows(connection):
+    #whether any of the API's tables already exists and holds data
+    existing = set(inspect(connection).get_table_names())
+    return any(connection.execute(select(1).select_from(table).limit(1)).first() for table in db.metadata.sorted_tables if table.name in existing)
+
+def prepare_tables(engine, drop):
+    #drop every table when asked to, otherwise stop rather than seed over existing data, then create the tables
+    if drop:
+        db.metadata.drop_all(engine)
+    else:
+        with engine.connect() as connection:
+            if has_rows(connection):
+                sys.exit(f'{engine.url.render_as_string(hide_password=True)} already holds data, pass --drop to drop every table and reseed it')
+    db.metadata.create_all(engine)
+
+def add_drop_argument(parser):
+    parser.add_argument('--drop', action='store_true', help='drop every table of the database before seeding it')
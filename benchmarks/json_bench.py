@@ -0,0 +1,74 @@
+#JSON benchmark: compares encode and decode throughput of the stdlib and orjson providers on order payloads
+#usage: python benchmarks/json_bench.py [--orders 10000] [--products-per-order 4] [--repeat 5]
+import argparse
+import datetime
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Main import create_app
+
+def order_payload(orders, products_per_order, seed=42):
+    #shaped like the OrderSchema dump returned by GET /orders
+    rng = random.Random(seed)
+    start = datetime.date(2024, 1, 1)
+    payload = []
+    for order_id in range(1, orders + 1):
+        ordered = start + datetime.timedelta(days=rng.randrange(365))
+        payload.append({
+            'id': order_id,
+            'customer_id': rng.randrange(1, orders // 10 + 2),
+            'date': ordered.isoformat(),
+            'expected_delivery': (ordered + datetime.timedelta(days=rng.randrange(2, 10))).isoformat(),
+            'products': [
+                {'id': product_id, 'product_name': f'Product {product_id}', 'price': round(rng.uniform(1, 1500), 2)}
+                for product_id in rng.sample(range(1, 5000), products_per_order)
+            ],
+        })
+    return payload
+
+def best_time(function, repeat):
+    #best of several runs, which is the least disturbed by other work on the machine
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def measure(provider_name, payload, repeat):
+    app = create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite://', 'JSON_PROVIDER': provider_name})
+    with app.app_context():
+        provider = app.json
+        encoded = provider.dumps(payload)
+        size_mb = len(encoded.encode()) / 1024 / 1024
+        encode_s = best_time(lambda: provider.dumps(payload), repeat)
+        decode_s = best_time(lambda: provider.loads(encoded), repeat)
+        response_s = best_time(lambda: provider.response(payload), repeat)
+    return {
+        'provider': type(provider).__name__,
+        'payload_mb': round(size_mb, 2),
+        'encode_ms': round(encode_s * 1000, 2),
+        'encode_mb_per_s': round(size_mb / encode_s, 1),
+        'decode_ms': round(decode_s * 1000, 2),
+        'decode_mb_per_s': round(size_mb / decode_s, 1),
+        'response_ms': round(response_s * 1000, 2),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare JSON provider throughput on realistic order payloads')
+    parser.add_argument('--orders', type=int, default=10000)
+    parser.add_argument('--products-per-order', type=int, default=4)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    payload = order_payload(args.orders, args.products_per_order)
+    results = [measure(provider_name, payload, args.repeat) for provider_name in ('stdlib', 'orjson')]
+    print(json.dumps({'orders': args.orders, 'products_per_order': args.products_per_order, 'results': results}, indent=4))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+#Load test: turns the requests in the Postman collections into scenarios and runs them concurrently against the app
+#reports throughput and p50/p95/p99 latency per endpoint, optionally saved as JSON and compared with an earlier run
+#usage: python benchmarks/load_test.py [--threads 8] [--duration 30] [--rows 1000] [--database-url URL] [--drop] [--output run.json] [--compare previous.json]
+import argparse
+import datetime
+import glob
+import itertools
+import json
+import os
+import random
+import re
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from urllib.parse import urlsplit
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from sqlalchemy import insert
+from werkzeug.security import generate_password_hash
+
+from Main import Customer, CustomerAccount, Order, Product, create_app, db, order_product
+from bench_db import add_drop_argument, pool_options, prepare_tables
+
+COLLECTIONS_DIR = os.path.join(REPO_DIR, 'Postman Collections')
+PASSWORD = 'Load$test1'
+
+#unique suffixes for fields with unique constraints, shared by every worker thread
+unique_ids = itertools.count(1)
+
+def load_scenarios(directory, methods):
+    #flatten every collection into (method, path, query, body fields) with the placeholders left in
+    scenarios = []
+    for path in sorted(glob.glob(os.path.join(directory, '*.postman_collection.json'))):
+        with open(path) as file:
+            items = json.load(file)['item']
+        while items:
+            item = items.pop(0)
+            if 'item' in item:
+                items.extend(item['item'])
+                continue
+            request = item['request']
+            if request['method'] not in methods:
+                continue
+            url = urlsplit(request['url']['raw'] if isinstance(request['url'], dict) else request['url'])
+            #the collection bodies are templates with blank values, so only their field names are kept
+            raw_body = (request.get('body') or {}).get('raw', '')
+            scenarios.append({
+                'method': request['method'],
+                'path': url.path,
+                'query': [part.split('=')[0] for part in url.query.split('&') if part],
+                'body': re.findall(r'"(\w+)"\s*:', raw_body) if request['method'] in ('POST', 'PUT') else [],
+            })
+    return scenarios
+
+def field_value(name, rows, rng):
+    #realistic values for the fields used in the collections, ids always point at seeded rows
+    if name in ('customer_id', 'order_id', 'product_id', 'customer_account_id', 'Product'):
+        return rng.randint(1, rows)
+    unique = next(unique_ids)
+    values = {
+        'name': f'Load Customer {unique}',
+        'email': f'load{unique}@example.com',
+        'phone': '1234567890',
+        'username': f'loaduser{unique}',
+        'password': PASSWORD,
+        'product_name': f'Load Product {unique}',
+        'price': round(rng.uniform(1, 1500), 2),
+        'stock_quantity': 1000000,
+        'date': '2024-08-01',
+        'expected_delivery': '2024-08-06',
+    }
+    return values[name]
+
+def build_request(scenario, rows, rng):
+    path = re.sub(r'<(\w+)>', lambda match: str(field_value(match.group(1), rows, rng)), scenario['path'])
+    query = '&'.join(f'{name}={field_value(name, rows, rng)}' for name in scenario['query'])
+    body = {name: field_value(name, rows, rng) for name in scenario['body']} or None
+    return f'{path}?{query}' if query else path, body
+
+def seed(app, rows, drop):
+    #rows of every table so the ids used by the scenarios exist, products get enough stock for every order
+    password_hash = generate_password_hash(PASSWORD)
+    with app.app_context():
+        prepare_tables(db.engine, drop)
+        db.session.execute(insert(Customer), [{'name': f'Customer {i}', 'email': f'customer{i}@example.com', 'phone': '1234567890'} for i in range(1, rows + 1)])
+        db.session.execute(insert(Product), [{'product_name': f'Product {i}', 'price': 9.99, 'stock_quantity': 1000000} for i in range(1, rows + 1)])
+        db.session.execute(insert(CustomerAccount), [{'username': f'customer{i}', 'password': password_hash, 'customer_id': i} for i in range(1, rows + 1)])
+        db.session.execute(insert(Order), [{'customer_id': i, 'date': datetime.date(2024, 8, 1), 'expected_delivery': datetime.date(2024, 8, 6)} for i in range(1, rows + 1)])
+        db.session.execute(insert(order_product), [{'order_id': i, 'product_id': i, 'quantity': 1} for i in range(1, rows + 1)])
+        db.session.commit()
+
+def run(app, scenarios, rows, threads, duration, seed_value):
+    #each thread picks scenarios at random until the time is up and records the latency and status of every request
+    results = defaultdict(lambda: {'latencies': [], 'statuses': Counter()})
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker(number):
+        client = app.test_client()
+        rng = random.Random(seed_value + number)
+        while time.perf_counter() < deadline:
+            scenario = rng.choice(scenarios)
+            url, body = build_request(scenario, rows, rng)
+            start = time.perf_counter()
+            status = client.open(url, method=scenario['method'], json=body).status_code
+            elapsed = time.perf_counter() - start
+            with lock:
+                result = results[f"{scenario['method']} {scenario['path']}"]
+                result['latencies'].append(elapsed * 1000)
+                result['statuses'][status] += 1
+
+    workers = [threading.Thread(target=worker, args=(number,)) for number in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return results, time.perf_counter() - start
+
+def summarise(results, elapsed):
+    endpoints = {}
+    for endpoint, result in sorted(results.items()):
+        latencies = result['latencies']
+        cut_points = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+        endpoints[endpoint] = {
+            'requests': len(latencies),
+            'requests_per_s': round(len(latencies) / elapsed, 1),
+            'p50_ms': round(cut_points[49], 2),
+            'p95_ms': round(cut_points[94], 2),
+            'p99_ms': round(cut_points[98], 2),
+            'statuses': {str(status): count for status, count in sorted(result['statuses'].items())},
+        }
+    return endpoints
+
+def compare(endpoints, previous):
+    #percentage change of throughput and p95 for every endpoint present in both runs
+    changes = {}
+    for endpoint, current in endpoints.items():
+        before = previous['endpoints'].get(endpoint)
+        if before and before['requests_per_s'] and before['p95_ms']:
+            changes[endpoint] = {
+                'requests_per_s_change_pct': round((current['requests_per_s'] / before['requests_per_s'] - 1) * 100, 1),
+                'p95_ms_change_pct': round((current['p95_ms'] / before['p95_ms'] - 1) * 100, 1),
+            }
+    return changes
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the Postman collection requests concurrently and report per endpoint latency')
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=30, help='seconds to keep sending requests')
+    parser.add_argument('--rows', type=int, default=1000, help='rows seeded into every table')
+    parser.add_argument('--methods', default='GET,POST,PUT', help='comma separated request methods to include, add DELETE to remove seeded rows as well')
+    parser.add_argument('--password-hash-iterations', type=int, default=600000, help='PBKDF2 cost used by the account endpoints')
+    parser.add_argument('--collections', default=COLLECTIONS_DIR)
+    parser.add_argument('--database-url', default='sqlite:////tmp/load_test.db')
+    add_drop_argument(parser)
+    parser.add_argument('--seed', type=int, default=42, help='random seed for the scenario mix')
+    parser.add_argument('--output', help='file to save the results to as JSON')
+    parser.add_argument('--compare', help='results file of an earlier run to compare against')
+    args = parser.parse_args()
+
+    scenarios = load_scenarios(args.collections, args.methods.split(','))
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': args.database_url,
+        'SQLALCHEMY_ENGINE_OPTIONS': pool_options(args.database_url, args.threads),
+        'PASSWORD_HASH_ITERATIONS': args.password_hash_iterations,
+    })
+    seed(app, args.rows, args.drop)
+    results, elapsed = run(app, scenarios, args.rows, args.threads, args.duration, args.seed)
+
+    endpoints = summarise(results, elapsed)
+    report = {
+        'started_at': datetime.datetime.now().isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'database': args.database_url.split(':')[0],
+        'threads': args.threads,
+        'duration_s': round(elapsed, 3),
+        'rows': args.rows,
+        'requests': sum(endpoint['requests'] for endpoint in endpoints.values()),
+        'requests_per_s': round(sum(endpoint['requests'] for endpoint in endpoints.values()) / elapsed, 1),
+        'endpoints': endpoints,
+    }
+    if args.compare:
+        with open(args.compare) as file:
+            report['changes'] = compare(endpoints, json.load(file))
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=4)
+    print(json.dumps(report, indent=4))
+
+if __name__ == '__main__':
+    main()
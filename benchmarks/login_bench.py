@@ -0,0 +1,84 @@
+#Login benchmark: measures logins per second and login latency for each password hash cost
+#usage: python benchmarks/login_bench.py [--iterations 100000,300000,600000] [--threads 8] [--logins 200]
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Main import Customer, create_app, db
+
+USERNAME = 'benchmarkuser'
+PASSWORD = 'Bench$mark1'
+
+def build_app(iterations, workers):
+    #each cost gets a fresh in-memory database holding one customer and account
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': 'sqlite://',
+        'PASSWORD_HASH_ITERATIONS': iterations,
+        'PASSWORD_HASH_WORKERS': workers,
+    })
+    with app.app_context():
+        db.create_all()
+        db.session.add(Customer(name='Benchmark', email='benchmark@example.com', phone='1234567890'))
+        db.session.commit()
+    response = app.test_client().post('/customeraccounts', json={'username': USERNAME, 'password': PASSWORD, 'customer_id': 1})
+    assert response.status_code == 201, response.json
+    return app
+
+def run(app, threads, logins):
+    #each thread logs in from a shared budget and records the latency of every attempt
+    remaining = [logins]
+    latencies = []
+    lock = threading.Lock()
+
+    def worker():
+        client = app.test_client()
+        while True:
+            with lock:
+                if remaining[0] == 0:
+                    return
+                remaining[0] -= 1
+            start = time.perf_counter()
+            status = client.post('/customeraccounts/login', json={'username': USERNAME, 'password': PASSWORD}).status_code
+            elapsed = time.perf_counter() - start
+            assert status == 200, status
+            with lock:
+                latencies.append(elapsed * 1000)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return latencies, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure login throughput against PBKDF2 iteration counts')
+    parser.add_argument('--iterations', default='100000,300000,600000', help='comma separated PBKDF2 iteration counts')
+    parser.add_argument('--threads', type=int, default=8, help='concurrent login requests')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='password hashing pool size')
+    parser.add_argument('--logins', type=int, default=200)
+    args = parser.parse_args()
+
+    results = []
+    for iterations in [int(value) for value in args.iterations.split(',')]:
+        app = build_app(iterations, args.workers)
+        latencies, elapsed = run(app, args.threads, args.logins)
+        cut_points = statistics.quantiles(latencies, n=100)
+        results.append({
+            'iterations': iterations,
+            'logins_per_s': round(args.logins / elapsed, 1),
+            'p50_ms': round(cut_points[49], 2),
+            'p95_ms': round(cut_points[94], 2),
+            'p99_ms': round(cut_points[98], 2),
+        })
+    print(json.dumps({'threads': args.threads, 'workers': args.workers, 'logins': args.logins, 'results': results}, indent=4))
+
+if __name__ == '__main__':
+    main()
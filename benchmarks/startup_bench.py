@@ -0,0 +1,58 @@
+#Startup benchmark: times importing Main and building an app with create_app in fresh interpreters
+#usage: python benchmarks/startup_bench.py [--runs 20] [--database-url sqlite:////tmp/startup_bench.db]
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+#measured inside each child process so interpreter start up is not counted
+CHILD_SCRIPT = """
+import json, os, sys, time
+start = time.perf_counter()
+import Main
+imported = time.perf_counter()
+app = Main.create_app({'SQLALCHEMY_DATABASE_URI': sys.argv[1]})
+built = time.perf_counter()
+print(json.dumps({'import_ms': (imported - start) * 1000, 'create_app_ms': (built - imported) * 1000}))
+"""
+
+def run_once(database_url):
+    #start a clean interpreter so module import caches don't hide the real cost
+    output = subprocess.run([sys.executable, '-c', CHILD_SCRIPT, database_url], cwd=REPO_DIR, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def summarize(samples):
+    return {
+        'median_ms': round(statistics.median(samples), 3),
+        'min_ms': round(min(samples), 3),
+        'max_ms': round(max(samples), 3),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure import plus app construction time of the E-commerce API')
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--database-url', default='sqlite:////tmp/startup_bench.db')
+    args = parser.parse_args()
+
+    #a SQLite file that does not exist before the runs must still not exist after them if startup never connects
+    database_path = args.database_url[len('sqlite:///'):] if args.database_url.startswith('sqlite:///') else None
+    if database_path and os.path.exists(database_path):
+        os.remove(database_path)
+
+    results = [run_once(args.database_url) for _ in range(args.runs)]
+    report = {
+        'runs': args.runs,
+        'import': summarize([result['import_ms'] for result in results]),
+        'create_app': summarize([result['create_app_ms'] for result in results]),
+        'total': summarize([result['import_ms'] + result['create_app_ms'] for result in results]),
+    }
+    if database_path:
+        report['database_touched'] = os.path.exists(database_path)
+    print(json.dumps(report, indent=4))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+#Stock contention benchmark: many threads order the same hot product and the final stock is checked for overselling
+#usage: python benchmarks/stock_contention_bench.py [--threads 16] [--orders 2000] [--stock 500] [--database-url URL] [--drop]
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Main import Customer, Product, create_app, db
+from bench_db import add_drop_argument, pool_options, prepare_tables
+
+ORDER_BODY = {"customer_id": 1, "date": "2024-08-01", "expected_delivery": "2024-08-06"}
+
+def build_app(database_url, threads, drop):
+    #size the pool so every worker thread can hold a connection, then start from empty tables
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': database_url,
+        'SQLALCHEMY_ENGINE_OPTIONS': pool_options(database_url, threads),
+    })
+    with app.app_context():
+        prepare_tables(db.engine, drop)
+    return app
+
+def seed(app, stock):
+    #one customer ordering from one hot product
+    with app.app_context():
+        db.session.add(Customer(name='Load Test', email='loadtest@example.com', phone='1234567890'))
+        db.session.add(Product(product_name='Hot Product', price=9.99, stock_quantity=stock))
+        db.session.commit()
+
+def run(app, threads, orders, quantity):
+    #each thread places orders from a shared budget until every attempt has been made
+    remaining = [orders]
+    lock = threading.Lock()
+    statuses = Counter()
+
+    def worker():
+        client = app.test_client()
+        while True:
+            with lock:
+                if remaining[0] == 0:
+                    return
+                remaining[0] -= 1
+            status = client.post(f'/orders?{"&".join(["Product=1"] * quantity)}', json=ORDER_BODY).status_code
+            with lock:
+                statuses[status] += 1
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return statuses, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure order placement throughput on a single hot product')
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--orders', type=int, default=2000)
+    parser.add_argument('--stock', type=int, default=500)
+    parser.add_argument('--quantity', type=int, default=1, help='units of the hot product per order')
+    parser.add_argument('--database-url', default='sqlite:////tmp/stock_contention_bench.db')
+    add_drop_argument(parser)
+    args = parser.parse_args()
+
+    app = build_app(args.database_url, args.threads, args.drop)
+    seed(app, args.stock)
+    statuses, elapsed = run(app, args.threads, args.orders, args.quantity)
+
+    #every accepted order must have taken stock exactly once
+    with app.app_context():
+        final_stock = db.session.get(Product, 1).stock_quantity
+    accepted = statuses.get(201, 0)
+    report = {
+        'threads': args.threads,
+        'attempts': args.orders,
+        'statuses': {str(status): count for status, count in sorted(statuses.items())},
+        'elapsed_s': round(elapsed, 3),
+        'orders_per_s': round(args.orders / elapsed, 1),
+        'accepted_orders_per_s': round(accepted / elapsed, 1),
+        'initial_stock': args.stock,
+        'final_stock': final_stock,
+        'oversold': final_stock < 0 or args.stock - final_stock != accepted * args.quantity,
+    }
+    print(json.dumps(report, indent=4))
+    if report['oversold']:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
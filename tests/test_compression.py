@@ -0,0 +1,30 @@
+#Response compression of error responses and streamed bodies
+import gzip
+
+import pytest
+
+from Main import create_app, db
+
+@pytest.fixture
+def client():
+    #compress every response however small, so the short error pages are compressed too
+    app = create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite://', 'COMPRESS_MIN_SIZE': 0})
+    with app.app_context():
+        db.create_all()
+    yield app.test_client()
+    with app.app_context():
+        db.drop_all()
+        db.engine.dispose()
+
+@pytest.mark.parametrize('method, path, status', [('GET', '/customers/999', 404), ('GET', '/nope', 404), ('DELETE', '/orders', 405)])
+def test_error_response_with_gzip_accepted(client, method, path, status):
+    response = client.open(path, method=method, headers={'Accept-Encoding': 'gzip'})
+    assert response.status_code == status
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert f'{status}'.encode() in gzip.decompress(response.data)
+
+def test_streamed_response_with_gzip_accepted(client):
+    response = client.get('/customers?stream=1', headers={'Accept-Encoding': 'gzip'})
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(response.data) == b'[]'
@@ -0,0 +1,30 @@
+#ETags built from the table versions shared by every worker process through the database
+import pytest
+
+from Main import create_app, db
+
+@pytest.fixture
+def workers(tmp_path):
+    #two apps standing in for two worker processes serving the same database
+    config = {'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'etags.db'}", 'PRODUCT_CACHE_MAXSIZE': 0}
+    apps = [create_app(config), create_app(config)]
+    with apps[0].app_context():
+        db.create_all()
+    yield [app.test_client() for app in apps]
+    for app in apps:
+        with app.app_context():
+            db.engine.dispose()
+
+def test_etag_matches_across_workers(workers):
+    first, second = workers
+    etag = first.get('/products').headers['ETag']
+    assert second.get('/products', headers={'If-None-Match': etag}).status_code == 304
+
+def test_write_on_one_worker_changes_etag_on_another(workers):
+    first, second = workers
+    etag = second.get('/products').headers['ETag']
+    assert first.post('/products', json={'product_name': 'Pen', 'price': 1.5, 'stock_quantity': 10}).status_code == 201
+    response = second.get('/products', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    assert [product['product_name'] for product in response.json] == ['Pen']
@@ -0,0 +1,37 @@
+#Filters and sorts of the list endpoints are only accepted when an index serves them
+import pytest
+
+from Main import create_app, db
+
+@pytest.fixture
+def client():
+    app = create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite://'})
+    with app.app_context():
+        db.create_all()
+    yield app.test_client()
+    with app.app_context():
+        db.drop_all()
+        db.engine.dispose()
+
+@pytest.mark.parametrize('path', [
+    '/customers?sort=-email',
+    '/customers?id[ne]=1&id[gt]=0',
+    '/products?price[gte]=10&sort=-price',
+    '/orders?customer_id=5&sort=-date',
+    '/customeraccounts?sort=customer_id',
+])
+def test_indexed_query_accepted(client, path):
+    assert client.get(path).status_code == 200
+
+@pytest.mark.parametrize('path, field', [
+    ('/customers?sort=name&limit=5', 'sort'),
+    ('/customers?name=Ann', 'name'),
+    ('/customers?id[ne]=1', 'id'),
+    ('/orders?sort=date', 'sort'),
+    ('/products?sort=price,stock_quantity', 'sort'),
+    ('/products?sort=price,-id', 'sort'),
+])
+def test_unindexed_query_rejected(client, path, field):
+    response = client.get(path)
+    assert response.status_code == 400
+    assert field in response.json
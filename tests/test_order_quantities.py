@@ -0,0 +1,33 @@
+#Repeated products of an order are stored once with a quantity, which every order response returns
+import pytest
+
+from Main import create_app, db
+
+@pytest.fixture
+def client():
+    app = create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite://'})
+    with app.app_context():
+        db.create_all()
+    client = app.test_client()
+    client.post('/customers', json={'name': 'Ann', 'email': 'ann@example.com', 'phone': '1234567890'})
+    for name in ('Pen', 'Pad'):
+        client.post('/products', json={'product_name': name, 'price': 1.5, 'stock_quantity': 10})
+    response = client.post('/orders?Product=1&Product=1&Product=2', json={'customer_id': 1, 'date': '2024-08-01', 'expected_delivery': '2024-08-05'})
+    assert response.status_code == 201
+    yield client
+    with app.app_context():
+        db.drop_all()
+        db.engine.dispose()
+
+@pytest.mark.parametrize('path, orders', [
+    ('/orders', lambda body: body),
+    ('/orders?fields=id,products', lambda body: body),
+    ('/orders/1', lambda body: [body]),
+    ('/orders/orderhistory?customer_id=1', lambda body: body),
+    ('/customers/1?expand=orders.products', lambda body: body['orders']),
+])
+def test_order_products_carry_quantity(client, path, orders):
+    response = client.get(path)
+    assert response.status_code == 200
+    products = orders(response.json)[0]['products']
+    assert [(product['id'], product['quantity']) for product in products] == [(1, 2), (2, 1)]
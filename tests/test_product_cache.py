@@ -0,0 +1,39 @@
+#Product cache entries are keyed by the shared products version and stay bounded for large catalogs
+import pytest
+
+from Main import create_app, db, product_cache
+
+def make_app(uri, **config):
+    return create_app({'SQLALCHEMY_DATABASE_URI': uri, **config})
+
+def add_products(client, count):
+    for number in range(count):
+        assert client.post('/products', json={'product_name': f'Product {number}', 'price': 1.5, 'stock_quantity': 10}).status_code == 201
+
+def test_write_on_one_worker_reloads_cache_on_another(tmp_path):
+    #two apps standing in for two worker processes with their own caches
+    uri = f"sqlite:///{tmp_path / 'cache.db'}"
+    first, second = make_app(uri), make_app(uri)
+    with first.app_context():
+        db.create_all()
+    first_client, second_client = first.test_client(), second.test_client()
+    add_products(first_client, 1)
+    assert len(second_client.get('/products').json) == 1
+    add_products(first_client, 1)
+    assert len(second_client.get('/products').json) == 2
+    for app in (first, second):
+        with app.app_context():
+            db.engine.dispose()
+
+@pytest.mark.parametrize('count, cached', [(3, True), (4, False)])
+def test_catalog_over_the_cap_is_not_cached(count, cached):
+    app = make_app('sqlite://', PRODUCT_CACHE_LIST_MAX_ROWS=3)
+    with app.app_context():
+        db.create_all()
+    client = app.test_client()
+    add_products(client, count)
+    assert len(client.get('/products').json) == count
+    with app.app_context():
+        cached_lists = [value for key, (value, _) in product_cache()._entries.items() if key[0] == 'products']
+        assert (cached_lists[0] is not None) == cached
+        db.engine.dispose()
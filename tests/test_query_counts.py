@@ -0,0 +1,59 @@
+#Statement counts of the order endpoints, which must stay the same however many orders are stored
+import datetime
+
+import pytest
+from sqlalchemy import insert
+
+from Main import Customer, Order, Product, create_app, db, order_product
+
+@pytest.fixture(params=[1, 10, 50])
+def client(request):
+    #in-memory database with the number of orders in the param, every order holding two products, counting statements per request
+    rows = request.param
+    app = create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite://', 'DB_INSTRUMENTATION': True})
+    with app.app_context():
+        db.create_all()
+        db.session.execute(insert(Customer), [{'name': 'Customer 1', 'email': 'customer1@example.com', 'phone': '1234567890'}])
+        db.session.execute(insert(Product), [{'product_name': f'Product {i}', 'price': 9.99, 'stock_quantity': 100} for i in range(1, rows + 2)])
+        db.session.execute(insert(Order), [{'customer_id': 1, 'date': datetime.date(2024, 8, 1) + datetime.timedelta(days=i), 'expected_delivery': datetime.date(2024, 8, 10)} for i in range(rows)])
+        db.session.execute(insert(order_product), [{'order_id': i, 'product_id': product_id, 'quantity': 1} for i in range(1, rows + 1) for product_id in (i, i + 1)])
+        db.session.commit()
+    yield app.test_client()
+    with app.app_context():
+        db.drop_all()
+        db.engine.dispose()
+
+def db_queries(response):
+    assert response.status_code == 200
+    return int(response.headers['X-DB-Queries'])
+
+def test_list_orders(client):
+    #the ETag's table versions, the orders and one IN query for their products
+    assert db_queries(client.get('/orders')) == 3
+
+def test_get_order(client):
+    #the ETag's table versions and the order joined to its products
+    assert db_queries(client.get('/orders/1')) == 2
+
+def test_not_modified_order(client):
+    #only the ETag's table versions
+    etag = client.get('/orders/1').headers['ETag']
+    response = client.get('/orders/1', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert int(response.headers['X-DB-Queries']) == 1
+
+def test_order_history(client):
+    #the page of orders and one IN query for their products
+    assert db_queries(client.get('/orders/orderhistory?customer_id=1')) == 2
+
+def test_missing_order(client):
+    #error responses still report the statements that ran before the 404, the table versions and the order lookup
+    response = client.get('/orders/999')
+    assert response.status_code == 404
+    assert int(response.headers['X-DB-Queries']) == 2
+
+def test_patch_missing_order(client):
+    #the UPDATE by primary key that matched no row
+    response = client.patch('/orders/999', json={'expected_delivery': '2024-09-01'})
+    assert response.status_code == 404
+    assert int(response.headers['X-DB-Queries']) == 1